@@ -9,3 +9,10 @@ MAX_BUILD_TIMEOUT = 10
 # be advised that MAX_TESTING_TIMEOUT means that TEST_TIMEOUT * len(tests) < MAX_TESTING_TIMEOUT
 # the default setting means that 32 tests each one for 1 second maximum are allowed
 MAX_TESTING_TIMEOUT = 32
+
+# amount of idle containers kept running to be reused by the next checks (0 disables reusing)
+CONTAINER_POOL_SIZE = 4
+
+# amount of cpu cores every container could use (None means no limit),
+# e.g. 1 makes concurrent checks not slow each other down
+CONTAINER_CPUS = None
@@ -3,8 +3,11 @@ import json
 
 import config
 from solution_checker.solution_checker import check_solution
+from solution_checker.docker_utils import container_pool, remove_stale_containers
 
 app = Flask(__name__)
+remove_stale_containers()
+container_pool.fill()
 
 
 class ResponseJSON(Response):
@@ -0,0 +1,243 @@
+import secrets
+import time
+
+from solution_checker.models import BuildResult, TestsResult
+from solution_checker.docker_utils import DockerExec, SOLUTION_USER, kill_processes
+import solution_checker.constants as c
+
+SOURCE_PATH = '/root/source'
+INPUT_PATH = '/root/input'
+OUTPUT_PATH = '/root/output'
+# build output, stdout and output files of all the tests are kept in memory, so their total size is limited
+OUTPUT_LIMIT = 16 * 1024 * 1024
+
+# runs build (when needed) and all the tests, arguments are: need to build (0 or 1) and tests count;
+# the marker line and then source code and test inputs as a tar archive are passed to stdin,
+# every test is wrapped with markers and its output file is printed before the END one (docker could not copy files
+# from tmpfs), so results of all tests could be recovered from a single stdout;
+# the marker is not passed as an argument, otherwise the solution could read it from /proc and fake the results
+RUN_SCRIPT = '''read -r marker
+tar -xf - -C /root
+cd {source_dir}
+mkdir -p {output_dir}
+if [ "$1" -eq 1 ]; then
+    make build
+    build_code=$?
+    echo "$marker BUILD_END $build_code"
+    [ $build_code -eq 0 ] || exit 0
+fi
+for ((i = 0; i < $2; i++)); do
+    export input_path={input_dir}/input_$i.txt
+    export output_path={output_dir}/output_$i.txt
+    export ARGS="$input_path $output_path"
+    echo "$marker BEGIN"
+    rm -f $output_path
+    cat $input_path | make -s ARGS="$ARGS" run
+    exit_code=$?
+    if [ $exit_code -eq 0 ] && [ -f $output_path ] && [ ! -L $output_path ]; then
+        size=$(stat -c %s $output_path)
+        echo "$marker OUTPUT $size"
+        head -c $size $output_path
+    fi
+    echo "$marker END $exit_code"
+    [ $exit_code -eq 0 ] || exit 0
+done
+'''.format(source_dir=SOURCE_PATH, input_dir=INPUT_PATH, output_dir=OUTPUT_PATH)
+
+
+# returns (exit_code, stdout, output file or None) for every finished test, raises ValueError when markers are malformed
+def parse_tests_output(output: bytes, marker: bytes) -> list:
+    begin_marker = marker + b' BEGIN\n'
+    end_marker = marker + b' END '
+    output_marker = marker + b' OUTPUT '
+
+    results = []
+    position = output.find(begin_marker)
+    while position != -1:
+        stdout_start = position + len(begin_marker)
+        stdout_end = end_start = output.find(end_marker, stdout_start)
+
+        # output file is printed with its size, so its content is never searched for markers
+        output_file = None
+        output_start = output.find(output_marker, stdout_start, stdout_end if stdout_end != -1 else None)
+        if output_start != -1:
+            size_end = output.find(b'\n', output_start)
+            if size_end == -1:
+                break
+            size = int(output[output_start + len(output_marker):size_end])
+            if size < 0:
+                raise ValueError('Negative size of the output file')
+            content_end = size_end + 1 + size
+            if len(output) < content_end:
+                break
+            output_file = output[size_end + 1:content_end]
+            stdout_end = output_start
+            end_start = output.find(end_marker, content_end)
+
+        # output could be cut in the middle of the line when the script is killed
+        if end_start == -1:
+            break
+        line_end = output.find(b'\n', end_start)
+        if line_end == -1:
+            break
+        exit_code = int(output[end_start + len(end_marker):line_end])
+
+        results.append((exit_code, output[stdout_start:stdout_end], output_file))
+        position = output.find(begin_marker, line_end + 1)
+    return results
+
+
+def check_tests_output(tests: list, output: bytes, marker: bytes, run_times: list, test_timeout: float) -> TestsResult:
+    tests_result = TestsResult(tests_total=len(tests))
+
+    # results are still clamped and checked in case the marker leaks to the solution anyway
+    try:
+        runs = parse_tests_output(output, marker)[0:min(len(tests), len(run_times))]
+    except ValueError:
+        tests_result.status = c.STATUS_RUNTIME_ERROR
+        tests_result.message = 'Unable to parse output of the tests'
+        return tests_result
+
+    for i, (exit_code, stdout, output_file) in enumerate(runs):
+        test_input, expected_output = tests[i]
+        run_time = run_times[i]
+        tests_result.time += run_time
+
+        if run_time > test_timeout:
+            tests_result.status = c.STATUS_RUNTIME_TIMEOUT
+            break
+
+        if exit_code != 0:
+            tests_result.status = c.STATUS_RUNTIME_ERROR
+            tests_result.message = stdout.decode(errors='replace')
+            break
+
+        # outputs are compared as bytes, they are decoded only for the message
+        answer = output_file if output_file is not None else stdout
+        expected = expected_output.encode()
+
+        # it's a practice to add \n at the end of output, but usually tests don't have it;
+        # big answers are compared in place instead of copying them without the last symbol
+        if answer[-1:] == b'\n' and expected[-1:] != b'\n':
+            is_correct = len(answer) == len(expected) + 1 and answer.startswith(expected)
+            answer = answer if is_correct else answer[0:-1]
+        else:
+            is_correct = answer == expected
+
+        if not is_correct:
+            tests_result.status = c.STATUS_TEST_ERROR
+            tests_result.message = 'For "{}" expected "{}", but got "{}"'.format(test_input, expected_output, answer.decode(errors='replace'))
+            break
+
+        tests_result.tests_passed += 1
+
+    return tests_result
+
+
+def wait_build(execution: DockerExec, build_end_marker: bytes, deadline: float) -> bool:
+    scanned = 0
+    while not execution.finished:
+        marker_position = execution.output.find(build_end_marker, scanned)
+        if marker_position == -1:
+            scanned = max(scanned, len(execution.output) - len(build_end_marker) + 1)
+        elif execution.output.find(b'\n', marker_position) != -1:
+            return True
+        else:
+            scanned = marker_position
+        if time.time() >= deadline:
+            return False
+        execution.read(deadline - time.time())
+    return True
+
+
+def wait_tests(execution: DockerExec, marker: bytes, test_timeout: float, tests_count: int) -> tuple:
+    # returns whether all the tests finished and the time of every finished test;
+    # time is measured here between the markers, the solution could not change it
+    # every test has its own deadline which starts when the previous test ends,
+    # and all the tests together could take no longer than the timeout of every test
+    begin_marker = marker + b' BEGIN\n'
+    end_marker = marker + b' END '
+    total_deadline = time.time() + test_timeout * max(tests_count, 1)
+    deadline = min(time.time() + test_timeout, total_deadline)
+    # build output could not contain the markers of the tests, so they are searched from the start
+    scanned = 0
+    expected_marker = begin_marker
+    begin_time = 0
+    run_times = []
+    while not execution.finished:
+        if time.time() >= deadline:
+            return False, run_times
+        execution.read(deadline - time.time())
+
+        while True:
+            marker_position = execution.output.find(expected_marker, scanned)
+            if marker_position == -1:
+                scanned = max(scanned, len(execution.output) - len(expected_marker) + 1)
+                break
+            scanned = marker_position + len(expected_marker)
+            # only END after a new BEGIN finishes a test, so repeated ENDs don't move the deadline
+            if expected_marker is end_marker:
+                run_times.append(time.time() - begin_time)
+                deadline = min(time.time() + test_timeout, total_deadline)
+                expected_marker = begin_marker
+            else:
+                begin_time = time.time()
+                expected_marker = end_marker
+    return True, run_times
+
+
+def run_solution(client, container, need_to_build: bool, tests: list, tar_files: memoryview, build_timeout: float, test_timeout: float) -> tuple:
+    marker = secrets.token_hex(8)
+
+    script_args = ['1' if need_to_build else '0', str(len(tests))]
+    # files are extracted by the script itself, so they belong to the user running the solution
+    command = ['/bin/bash', '-c', RUN_SCRIPT, 'bash'] + script_args
+    stdin = [(marker + '\n').encode(), tar_files]
+    execution = DockerExec(client, container, command, '/root', stdin, OUTPUT_LIMIT, SOLUTION_USER)
+    start_time = time.time()
+    try:
+        build_result = BuildResult(status=c.STATUS_OK)
+        if need_to_build:
+            build_end_marker = (marker + ' BUILD_END ').encode()
+            build_finished = wait_build(execution, build_end_marker, start_time + build_timeout)
+            build_result.time = time.time() - start_time
+
+            if not build_finished:
+                kill_processes(container)
+                build_result.status = c.STATUS_BUILD_TIMEOUT
+                return build_result, TestsResult()
+
+            if execution.output_exceeded:
+                kill_processes(container)
+                build_result.status = c.STATUS_BUILD_ERROR
+                build_result.message = 'Build output exceeded {} bytes'.format(OUTPUT_LIMIT)
+                return build_result, TestsResult()
+
+            build_output, _, tail = execution.output.partition(build_end_marker)
+            if tail.split()[0:1] != [b'0']:
+                build_result.status = c.STATUS_BUILD_ERROR
+                build_result.message = build_output.decode(errors='replace')
+                return build_result, TestsResult()
+
+        start_time = time.time()
+        tests_finished, run_times = wait_tests(execution, marker.encode(), test_timeout, len(tests))
+        test_time = time.time() - start_time
+        if not tests_finished or execution.output_exceeded:
+            kill_processes(container)
+    finally:
+        execution.close()
+
+    tests_result = check_tests_output(tests, execution.output, marker.encode(), run_times, test_timeout)
+    if tests_result.status == c.STATUS_OK and tests_result.tests_passed < len(tests):
+        if execution.output_exceeded:
+            tests_result.status = c.STATUS_RUNTIME_ERROR
+            tests_result.message = 'Output of the tests exceeded {} bytes after {} tests'.format(OUTPUT_LIMIT, tests_result.tests_passed)
+        elif tests_finished:
+            # tests script itself could be killed by the solution, so not every test has its result
+            tests_result.status = c.STATUS_RUNTIME_ERROR
+            tests_result.message = 'Testing was interrupted after {} tests'.format(tests_result.tests_passed)
+        else:
+            tests_result.status = c.STATUS_RUNTIME_TIMEOUT
+            tests_result.time = test_time
+
+    return build_result, tests_result
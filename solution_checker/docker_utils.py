@@ -1,59 +1,247 @@
 import docker
+from docker.utils import socket as docker_socket
 
-import tarfile
-from io import BytesIO
+import atexit
+import os
+import select
+import socket
+import struct
+from queue import Queue, Empty, Full
+from threading import Lock
 
-from typing import Union
+import config
+
+_client = None
+_client_lock = Lock()
+
+
+def get_docker_client():
+    # client keeps its connection pool to the daemon, so it is shared between all checks
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = docker.from_env()
+        return _client
+
+
+def close_docker_client():
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
+atexit.register(close_docker_client)
+
+# solutions are run by an unprivileged user, so they could change nothing except their own files and processes
+SOLUTION_USER = 'nobody'
+# containers are labelled with pid of the process which created them, so the ones left by a killed process are found
+OWNER_LABEL = 'liokorcode_checker.owner_pid'
 
 
 def create_container():
-    client = docker.from_env()
+    client = get_docker_client()
+    # configs created before the limit was added have no cpus for it, then containers are not limited
+    cpus = getattr(config, 'CONTAINER_CPUS', None)
+    # no tty is needed: output is read from exec sockets, and the container only has to stay alive between execs
+    # init reaps orphaned processes of the solutions, otherwise zombies would pile up in reused containers
+    # containers are reused by the next checks, so root filesystem is read-only and only tmpfs could be written
     container = client.containers.run(
         'liokorcode_checker',
+        command=['tail', '-f', '/dev/null'],
         detach=True,
-        tty=True,
+        tty=False,
+        init=True,
+        stop_signal='SIGKILL',
+        read_only=True,
+        tmpfs={
+            '/root': 'rw,exec,nosuid,mode=1777',
+            '/tmp': 'rw,exec,nosuid,mode=1777',
+        },
+        environment={'HOME': '/root'},
+        security_opt=['no-new-privileges'],
 
         network_disabled=True,
         mem_limit='128m',
+        nano_cpus=int(cpus * 1e9) if cpus else None,
+        labels={OWNER_LABEL: str(os.getpid())},
     )
-    return client, container
+    return container
 
 
 def remove_container(client, container_id):
-    container = client.containers.get(container_id)
-    if container.status == 'running':
-        container.kill()
-    container.remove()
+    # forced removal kills the running container itself, no need to fetch its status first
+    client.api.remove_container(container_id, force=True)
 
 
-def put_file_to_container(container, path: str, content: str):
-    path = path.split('/')
-    name, path = path[-1], '/'.join(path[0:-1])
+def process_exists(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
 
-    bio = BytesIO()
-    tar = tarfile.open(fileobj=bio, mode='w')
-    encoded = content.encode()
-    file = BytesIO(encoded)
-    tarinfo = tarfile.TarInfo(name)
-    tarinfo.size = len(encoded)
-    tar.addfile(tarinfo, fileobj=file)
-    tar.close()
-    bio.seek(0)
+def remove_stale_containers():
+    # containers of a killed process (e.g. on restart of the service) are not removed at exit, so they are removed
+    # on start instead; the current process has no containers yet, so the ones with its pid are left by a previous one
+    try:
+        client = get_docker_client()
+        containers = client.containers.list(all=True, filters={'label': OWNER_LABEL})
+    except Exception as e:
+        print('Unable to list stale containers: {}'.format(e))
+        return
 
-    container.put_archive(path, bio.read())
+    for container in containers:
+        try:
+            owner_pid = int(container.labels[OWNER_LABEL])
+            if owner_pid != os.getpid() and process_exists(owner_pid):
+                continue
+        except ValueError:
+            pass
 
+        try:
+            remove_container(client, container.id)
+        except Exception as e:
+            print('Unable to remove container {}: {}'.format(container.id, e))
 
-def get_file_from_container(container, fname: str) -> Union[str, None]:
-    try:
-        bits, stats = container.get_archive(fname)
-        bio = BytesIO()
-        for chunk in bits:
-            bio.write(chunk)
-        bio.seek(0)
-        tar = tarfile.open(fileobj=bio)
-        content = tar.extractfile(tar.getmembers()[0]).read().decode()
-        tar.close()
-
-        return content
-    except Exception:
-        return None
+
+def kill_processes(container):
+    # kills every process of the solution, the container itself (its init is run by root) keeps running
+    container.exec_run(['/bin/bash', '-c', 'kill -9 -1'], user=SOLUTION_USER)
+
+
+class DockerExec:
+    def __init__(self, client, container, cmd: list, workdir: str, stdin: list = None, output_limit: int = None, user: str = ''):
+        # stdin is a list of buffers which are sent one after another
+        exec_id = client.api.exec_create(container.id, cmd, workdir=workdir, stdin=stdin is not None, user=user)['Id']
+        self.socket = client.api.exec_start(exec_id, socket=True)
+        if stdin is not None:
+            # closing our side of the connection passes EOF to the command
+            raw_socket = getattr(self.socket, '_sock', self.socket)
+            for data in stdin:
+                raw_socket.sendall(data)
+            raw_socket.shutdown(socket.SHUT_WR)
+        # output is appended in place, so reading it takes linear time
+        self.buffer = bytearray()
+        self.output = bytearray()
+        self.output_limit = output_limit
+        self.output_exceeded = False
+        self.finished = False
+
+    def read(self, timeout: float):
+        # waits for the next chunk of output for at most timeout seconds
+        readable, _, _ = select.select([self.socket], [], [], max(timeout, 0))
+        if len(readable) == 0:
+            return
+
+        data = docker_socket.read(self.socket, 65536)
+        if not data:
+            self.finished = True
+            return
+
+        # stdout and stderr frames are merged: header is [stream, 0, 0, 0, size (4 bytes, big endian)]
+        self.buffer += data
+        position = 0
+        while len(self.buffer) - position >= 8:
+            size = struct.unpack_from('>L', self.buffer, position + 4)[0]
+            if len(self.buffer) - position < 8 + size:
+                break
+            self.output += self.buffer[position + 8:position + 8 + size]
+            position += 8 + size
+        del self.buffer[0:position]
+
+        # the rest of the output is not read, the command has to be killed by the caller
+        if self.output_limit is not None and len(self.output) > self.output_limit:
+            self.output_exceeded = True
+            self.finished = True
+
+    def close(self):
+        self.socket.close()
+        # socket.SocketIO does not close the socket it wraps
+        if hasattr(self.socket, '_sock'):
+            self.socket._sock.close()
+
+
+class ContainerPool:
+    # kills everything left by the previous solution and removes its files from every writable directory,
+    # its SysV IPC objects and POSIX message queues (every container has its own IPC namespace)
+    reset_command = ['/bin/bash', '-c', '''kill -9 -1
+set -e
+for kind in m:shm q:msg s:sem; do
+    for id in $(awk 'NR > 1 {print $2}' /proc/sysvipc/${kind#*:}); do
+        ipcrm -${kind%:*} $id
+    done
+done
+find /root /tmp /dev/shm -mindepth 1 -delete
+[ ! -d /dev/mqueue ] || find /dev/mqueue -mindepth 1 -delete
+''']
+
+    def __init__(self, size: int):
+        self.size = size
+        self.containers = Queue(maxsize=size)
+
+    def fill(self):
+        # runs on start of the app, which must not fail (e.g. when the daemon is not running yet),
+        # the pool is filled with released containers later anyway
+        try:
+            while self.size > 0 and not self.containers.full():
+                container = create_container()
+                try:
+                    self.containers.put_nowait(container)
+                except Full:
+                    self.remove(container)
+        except Exception as e:
+            print('Unable to fill container pool: {}'.format(e))
+
+    def acquire(self):
+        while True:
+            try:
+                container = self.containers.get_nowait()
+            except Empty:
+                return create_container()
+
+            # idle container could stop (e.g. after restart of the daemon), then the next one is taken
+            try:
+                container.reload()
+                if container.status == 'running':
+                    return container
+            except docker.errors.APIError:
+                pass
+            self.remove(container)
+
+    def release(self, container):
+        # runs in the background and nobody reads its result, so errors are printed here
+        # container that could not be reset (e.g. killed on timeout) is not reused
+        try:
+            if self.size > 0 and container.exec_run(self.reset_command, user=SOLUTION_USER).exit_code == 0:
+                self.containers.put_nowait(container)
+                return
+        except Full:
+            pass
+        except Exception as e:
+            print('Unable to reset container {}: {}'.format(container.id, e))
+
+        self.remove(container)
+
+    def remove(self, container):
+        try:
+            remove_container(get_docker_client(), container.id)
+        except Exception as e:
+            print('Unable to remove container {}: {}'.format(container.id, e))
+
+    def clear(self):
+        while True:
+            try:
+                container = self.containers.get_nowait()
+            except Empty:
+                return
+            self.remove(container)
+
+
+# configs created before the pool was added have no size for it, then containers are not reused
+container_pool = ContainerPool(getattr(config, 'CONTAINER_POOL_SIZE', 0))
+atexit.register(container_pool.clear)
@@ -4,6 +4,16 @@ import solution_checker.constants as c
 
 
 class CheckResult:
+    json_keys = {
+        'check_time': 'checkTime',
+        'build_time': 'buildTime',
+        'check_result': 'checkResult',
+        'check_message': 'checkMessage',
+        'tests_passed': 'testsPassed',
+        'tests_total': 'testsTotal',
+        'lint_success': 'lintSuccess',
+    }
+
     def __init__(self,
                  check_time: float = 0.0,
                  build_time: float = 0.0,
@@ -22,12 +32,7 @@ class CheckResult:
         self.lint_success = lint_success
 
     def json(self) -> str:
-        json_data = {}
-        for key, value in self.__dict__.items():
-            key_split = key.split('_')
-            new_key = key_split[0] + ''.join(word.capitalize() for word in key_split[1:])
-            json_data[new_key] = value
-        return json.dumps(json_data)
+        return json.dumps({json_key: getattr(self, key) for key, json_key in self.json_keys.items()})
 
 
 class BuildResult:
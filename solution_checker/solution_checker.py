@@ -1,12 +1,18 @@
-from solution_checker.check_steps.build import build_solution
-from solution_checker.check_steps.test import test_solution
+from concurrent.futures import ThreadPoolExecutor
+
+from solution_checker.check_steps.run import run_solution
 from solution_checker.check_steps.lint import lint_solution
 
-from solution_checker.models import CheckResult, BuildResult, TestsResult, LintResult
+from solution_checker.models import CheckResult, LintResult
 from solution_checker.utils import files_to_tar
-from solution_checker.docker_utils import create_container, remove_container
+from solution_checker.docker_utils import get_docker_client, container_pool
 import solution_checker.constants as c
 
+# containers are reset and returned to the pool after the result is sent
+cleanup_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='cleanup')
+# linting depends only on the source code, so it runs while the solution is being built and tested
+lint_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='lint')
+
 
 def check_solution(source_code: dict, tests: list, build_timeout: float, test_timeout: float) -> CheckResult:
     makefile = source_code.get('Makefile', None)
@@ -16,38 +22,41 @@ def check_solution(source_code: dict, tests: list, build_timeout: float, test_ti
         return CheckResult(check_result=c.STATUS_BUILD_ERROR, check_message='Makefile must at least contain "run:"')
 
     need_to_build = makefile.find('build:') != -1
+    lint_future = lint_executor.submit(lint_solution, source_code)
 
+    # source code and tests are encoded separately, so the one which is broken is reported
     try:
-        tar_source = files_to_tar(source_code, 'source/')
+        files = {'source/' + name: content.encode() for name, content in source_code.items()}
     except Exception:
         raise Exception('Unable to parse source code!')
 
-    client, container = create_container()
-
     try:
-        container.put_archive('/root', tar_source.read())
+        files.update({'input/input_{}.txt'.format(i): test[0].encode() for i, test in enumerate(tests)})
     except Exception:
-        remove_container(client, container.id)
-        raise Exception('Unable to create requested filesystem!')
+        raise Exception('Unable to parse tests!')
 
-    message = ''
+    tar_files = files_to_tar(files, '')
 
-    build_result = BuildResult(status=c.STATUS_OK)
-    if need_to_build:
-        build_result = build_solution(client, container, build_timeout)
-        message += build_result.message + '\n' if len(build_result.message) > 0 else ''
+    client = get_docker_client()
+    container = container_pool.acquire()
 
-    tests_result = TestsResult()
-    if build_result.status == c.STATUS_OK:
-        tests_result = test_solution(client, container, tests, test_timeout)
-        message += tests_result.message + '\n' if len(tests_result.message) > 0 else ''
+    try:
+        # archive is sent straight from the buffer without copying it into bytes
+        with tar_files.getbuffer() as files_view:
+            build_result, tests_result = run_solution(client, container, need_to_build, tests, files_view, build_timeout, test_timeout)
+    finally:
+        cleanup_executor.submit(container_pool.release, container)
+
+    message = ''
+    message += build_result.message + '\n' if len(build_result.message) > 0 else ''
+    message += tests_result.message + '\n' if len(tests_result.message) > 0 else ''
 
     lint_result = LintResult(status=c.STATUS_LINT_ERROR)
     if build_result.status == c.STATUS_OK and tests_result.status == c.STATUS_OK:
-        lint_result = lint_solution(source_code)
+        lint_result = lint_future.result()
         message += lint_result.message if len(lint_result.message) > 0 else ''
-
-    remove_container(client, container.id)
+    else:
+        lint_future.cancel()
 
     check_result = build_result.status if build_result.status != c.STATUS_OK else tests_result.status
     return CheckResult(
@@ -4,13 +4,15 @@ import tarfile
 
 def files_to_tar(files: dict, base_path: str) -> BytesIO:
     bio = BytesIO()
-    tar = tarfile.open(fileobj=bio, mode='w')
+    tar = tarfile.open(fileobj=bio, mode='w|')
+    # addfile copies tarinfo, so the same one is filled for every file
+    tarinfo = tarfile.TarInfo()
     for name, content in files.items():
-        encoded = content.encode()
-        file = BytesIO(encoded)
-        tarinfo = tarfile.TarInfo(base_path + name)
+        # content could be already encoded by the caller
+        encoded = content if isinstance(content, bytes) else content.encode()
+        tarinfo.name = base_path + name
         tarinfo.size = len(encoded)
-        tar.addfile(tarinfo, fileobj=file)
+        tar.addfile(tarinfo, fileobj=BytesIO(encoded))
     tar.close()
     bio.seek(0)
     return bio
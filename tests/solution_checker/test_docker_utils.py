@@ -0,0 +1,190 @@
+import os
+import socket
+import struct
+import unittest
+
+import solution_checker.docker_utils as docker_utils
+from solution_checker.docker_utils import DockerExec, ContainerPool, OWNER_LABEL, remove_stale_containers
+
+
+def frame(data: bytes, stream: int = 1) -> bytes:
+    return struct.pack('>BxxxL', stream, len(data)) + data
+
+
+class FakeAPI:
+    # exec socket is one end of a socket pair, the test plays the daemon on the other one
+    def __init__(self):
+        self.daemon_socket, self.exec_socket = socket.socketpair()
+
+    def exec_create(self, container_id, cmd, workdir=None, stdin=False, user=''):
+        self.stdin = stdin
+        return {'Id': 'exec_id'}
+
+    def exec_start(self, exec_id, socket=False):
+        return self.exec_socket
+
+
+class FakeClient:
+    def __init__(self):
+        self.api = FakeAPI()
+
+
+class FakeContainer:
+    id = 'container_id'
+
+
+class DockerExecTest(unittest.TestCase):
+    def setUp(self):
+        self.client = FakeClient()
+        self.daemon_socket = self.client.api.daemon_socket
+
+    def tearDown(self):
+        self.daemon_socket.close()
+
+    def start(self, stdin: list = None, output_limit: int = None) -> DockerExec:
+        execution = DockerExec(self.client, FakeContainer(), ['true'], '/root', stdin, output_limit)
+        self.addCleanup(execution.close)
+        return execution
+
+    def read_all(self, execution: DockerExec):
+        while not execution.finished:
+            execution.read(1)
+
+    def test_frames(self):
+        execution = self.start()
+        self.daemon_socket.sendall(frame(b'out\n') + frame(b'err\n', 2) + frame(b'') + frame(b'end'))
+        self.daemon_socket.close()
+        self.read_all(execution)
+        self.assertEqual(execution.output, b'out\nerr\nend')
+        self.assertFalse(execution.output_exceeded)
+
+    def test_split_frames(self):
+        # frames and their headers could be split between reads
+        execution = self.start()
+        data = frame(b'first') + frame(b'second' * 10000) + frame(b'third')
+        for i in [3, 7, 8, 12, 20, 50000, len(data)]:
+            self.daemon_socket.sendall(data[0:i])
+            data = data[i:]
+            execution.read(1)
+        self.daemon_socket.close()
+        self.read_all(execution)
+        self.assertEqual(execution.output, b'first' + b'second' * 10000 + b'third')
+
+    def test_read_timeout(self):
+        execution = self.start()
+        execution.read(0.01)
+        self.assertEqual(execution.output, b'')
+        self.assertFalse(execution.finished)
+
+    def test_output_limit(self):
+        execution = self.start(output_limit=10)
+        self.daemon_socket.sendall(frame(b'12345') + frame(b'67890'))
+        execution.read(1)
+        self.assertFalse(execution.finished)
+        self.daemon_socket.sendall(frame(b'1'))
+        execution.read(1)
+        self.assertTrue(execution.finished)
+        self.assertTrue(execution.output_exceeded)
+
+    def test_stdin(self):
+        execution = self.start(stdin=[b'input ', memoryview(b'data')])
+        self.assertTrue(self.client.api.stdin)
+        received = b''
+        while True:
+            data = self.daemon_socket.recv(1024)
+            if not data:
+                break
+            received += data
+        self.assertEqual(received, b'input data')
+
+        self.daemon_socket.sendall(frame(b'ok'))
+        self.daemon_socket.close()
+        self.read_all(execution)
+        self.assertEqual(execution.output, b'ok')
+
+
+class FakeLabelledContainer:
+    def __init__(self, container_id: str, labels: dict):
+        self.id = container_id
+        self.labels = labels
+
+
+class FakeContainers:
+    def __init__(self, containers: list, error: Exception = None):
+        self.listed = containers
+        self.error = error
+        self.created = []
+
+    def list(self, all=False, filters=None):
+        if self.error is not None:
+            raise self.error
+        return [container for container in self.listed if filters['label'] in container.labels]
+
+    def run(self, image, **kwargs):
+        if self.error is not None:
+            raise self.error
+        container = FakeLabelledContainer('created_{}'.format(len(self.created)), kwargs['labels'])
+        self.created.append(container)
+        return container
+
+
+class FakeContainersAPI:
+    def __init__(self):
+        self.removed = []
+
+    def remove_container(self, container_id, force=False):
+        self.removed.append(container_id)
+
+
+class FakeContainersClient:
+    def __init__(self, containers: list = None, error: Exception = None):
+        self.containers = FakeContainers([] if containers is None else containers, error)
+        self.api = FakeContainersAPI()
+
+
+class ContainersTest(unittest.TestCase):
+    # the shared client is replaced, it is created on demand by the code under test
+    def use_client(self, client: FakeContainersClient):
+        docker_utils._client = client
+        self.addCleanup(setattr, docker_utils, '_client', None)
+
+    def test_remove_stale_containers(self):
+        # pid of a finished child process is not used by anybody right after it is reaped
+        dead_pid = os.fork()
+        if dead_pid == 0:
+            os._exit(0)
+        os.waitpid(dead_pid, 0)
+
+        client = FakeContainersClient([
+            FakeLabelledContainer('dead', {OWNER_LABEL: str(dead_pid)}),
+            FakeLabelledContainer('own', {OWNER_LABEL: str(os.getpid())}),
+            FakeLabelledContainer('alive', {OWNER_LABEL: str(os.getppid())}),
+            FakeLabelledContainer('broken', {OWNER_LABEL: 'garbage'}),
+            FakeLabelledContainer('foreign', {}),
+        ])
+        self.use_client(client)
+        remove_stale_containers()
+        self.assertEqual(client.api.removed, ['dead', 'own', 'broken'])
+
+    def test_remove_stale_containers_error(self):
+        self.use_client(FakeContainersClient(error=ConnectionError('daemon is not running')))
+        remove_stale_containers()
+
+    def test_fill(self):
+        client = FakeContainersClient()
+        self.use_client(client)
+        pool = ContainerPool(2)
+        pool.fill()
+        self.assertEqual(pool.containers.qsize(), 2)
+        for container in client.containers.created:
+            self.assertEqual(container.labels, {OWNER_LABEL: str(os.getpid())})
+
+    def test_fill_error(self):
+        self.use_client(FakeContainersClient(error=ConnectionError('daemon is not running')))
+        pool = ContainerPool(2)
+        pool.fill()
+        self.assertEqual(pool.containers.qsize(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
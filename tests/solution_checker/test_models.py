@@ -0,0 +1,42 @@
+import json
+import unittest
+
+import solution_checker.constants as c
+from solution_checker.models import CheckResult
+
+
+class CheckResultTest(unittest.TestCase):
+    def test_json(self):
+        result = CheckResult(
+            check_time=0.1234,
+            build_time=1.5,
+            check_result=c.STATUS_TEST_ERROR,
+            check_message='For "1 2" expected "3", but got "4"\n',
+            tests_passed=1,
+            tests_total=9,
+            lint_success=True,
+        )
+        self.assertEqual(json.loads(result.json()), {
+            'checkTime': 0.1234,
+            'buildTime': 1.5,
+            'checkResult': c.STATUS_TEST_ERROR,
+            'checkMessage': 'For "1 2" expected "3", but got "4"\n',
+            'testsPassed': 1,
+            'testsTotal': 9,
+            'lintSuccess': True,
+        })
+
+    def test_json_default(self):
+        self.assertEqual(json.loads(CheckResult().json()), {
+            'checkTime': 0.0,
+            'buildTime': 0.0,
+            'checkResult': -1,
+            'checkMessage': '',
+            'testsPassed': 0,
+            'testsTotal': 0,
+            'lintSuccess': False,
+        })
+
+
+if __name__ == '__main__':
+    unittest.main()
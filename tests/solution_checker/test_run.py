@@ -0,0 +1,231 @@
+import time
+import unittest
+
+import solution_checker.constants as c
+from solution_checker.check_steps.run import parse_tests_output, check_tests_output, wait_tests
+
+marker = b'0123456789abcdef'
+
+
+# every run is (stdout, exit_code) or (stdout, exit_code, output file)
+def make_output(*runs) -> bytes:
+    output = b''
+    for stdout, exit_code, *output_file in runs:
+        output += marker + b' BEGIN\n' + stdout
+        for content in output_file:
+            output += marker + b' OUTPUT ' + str(len(content)).encode() + b'\n' + content
+        output += marker + b' END ' + exit_code + b'\n'
+    return output
+
+
+class FakeExecution:
+    # prints the chunks of output one after another every interval until it has printed count of them
+    def __init__(self, chunks: list, interval: float, count: int):
+        self.chunks = chunks
+        self.interval = interval
+        self.count = count
+        self.printed = 0
+        self.output = bytearray()
+        self.finished = False
+
+    def read(self, timeout: float):
+        if timeout < self.interval:
+            time.sleep(timeout)
+            return
+        time.sleep(self.interval)
+        self.output += self.chunks[self.printed % len(self.chunks)]
+        self.printed += 1
+        self.finished = self.printed == self.count
+
+
+class WaitTestsTest(unittest.TestCase):
+    def wait(self, execution: FakeExecution, test_timeout: float, tests_count: int) -> tuple:
+        start_time = time.time()
+        finished, run_times = wait_tests(execution, marker, test_timeout, tests_count)
+        return finished, run_times, time.time() - start_time
+
+    def test_finished(self):
+        execution = FakeExecution([make_output([b'3\n', b'0'])], 0.05, 4)
+        finished, run_times, wait_time = self.wait(execution, 0.2, 4)
+        self.assertTrue(finished)
+        self.assertEqual(len(run_times), 4)
+        self.assertLess(wait_time, 0.4)
+
+    def test_run_times(self):
+        # time of the test is measured between its markers, whatever the solution prints
+        execution = FakeExecution([marker + b' BEGIN\n', b'3\n' + marker + b' END 0\n'], 0.1, 4)
+        finished, run_times, wait_time = self.wait(execution, 0.5, 2)
+        self.assertTrue(finished)
+        self.assertEqual(len(run_times), 2)
+        for run_time in run_times:
+            self.assertAlmostEqual(run_time, 0.1, delta=0.05)
+
+    def test_timeout_per_test(self):
+        # every test takes less than its timeout, all of them together take longer
+        execution = FakeExecution([make_output([b'3\n', b'0'])], 0.15, 4)
+        finished, run_times, wait_time = self.wait(execution, 0.2, 4)
+        self.assertTrue(finished)
+        self.assertGreater(wait_time, 0.2)
+
+    def test_repeated_end(self):
+        # END without a new BEGIN does not finish a test, so it does not move the deadline
+        execution = FakeExecution([marker + b' END 0\n'], 0.05, 100)
+        finished, run_times, wait_time = self.wait(execution, 0.2, 4)
+        self.assertFalse(finished)
+        self.assertEqual(run_times, [])
+        self.assertLess(wait_time, 0.4)
+
+    def test_total_timeout(self):
+        execution = FakeExecution([make_output([b'3\n', b'0'])], 0.05, 100)
+        finished, run_times, wait_time = self.wait(execution, 0.2, 2)
+        self.assertFalse(finished)
+        self.assertGreater(wait_time, 0.35)
+        self.assertLess(wait_time, 0.6)
+
+
+class ParseTestsOutputTest(unittest.TestCase):
+    def test_finished(self):
+        output = make_output([b'3\n', b'0'], [b'', b'1'])
+        self.assertEqual(parse_tests_output(output, marker), [(0, b'3\n', None), (1, b'', None)])
+
+    def test_stdout_without_newline(self):
+        output = marker + b' BEGIN\n3' + marker + b' END 0\n'
+        self.assertEqual(parse_tests_output(output, marker), [(0, b'3', None)])
+
+    def test_partial(self):
+        # the last test is still running, so it has no result yet
+        output = make_output([b'3\n', b'0']) + marker + b' BEGIN\n9'
+        self.assertEqual(parse_tests_output(output, marker), [(0, b'3\n', None)])
+
+    def test_interrupted(self):
+        # output could be cut anywhere when the script is killed
+        output = make_output([b'3\n', b'0'])
+        for end in [len(output) - 1, len(output) - 2, len(marker) + 3]:
+            self.assertEqual(parse_tests_output(output[0:end], marker), [], msg=output[0:end])
+        self.assertEqual(parse_tests_output(b'', marker), [])
+
+        # test is not counted until its output file is printed completely
+        output = make_output([b'', b'0', b'3\n' + marker + b' END 0\n'])
+        for end in range(len(marker) + 8, len(output) - 1, 5):
+            self.assertEqual(parse_tests_output(output[0:end], marker), [], msg=output[0:end])
+
+    def test_output_file(self):
+        output = make_output([b'debug\n', b'0', b'3\n'], [b'9\n', b'0'], [b'', b'0', b''])
+        self.assertEqual(parse_tests_output(output, marker), [(0, b'debug\n', b'3\n'), (0, b'9\n', None), (0, b'', b'')])
+
+    def test_output_file_with_markers(self):
+        # content of the output file is taken by its size, so markers in it are not parsed
+        content = b'1\n' + marker + b' END 1\n' + marker + b' BEGIN\n'
+        output = make_output([b'', b'0', content], [b'9', b'0'])
+        self.assertEqual(parse_tests_output(output, marker), [(0, b'', content), (0, b'9', None)])
+
+    def test_build_output_is_skipped(self):
+        output = b'gcc main.c\n' + marker + b' BUILD_END 0\n' + make_output([b'3', b'0'])
+        self.assertEqual(parse_tests_output(output, marker), [(0, b'3', None)])
+
+    def test_malformed(self):
+        with self.assertRaises(ValueError):
+            parse_tests_output(marker + b' BEGIN\n' + marker + b' END garbage\n', marker)
+        with self.assertRaises(ValueError):
+            parse_tests_output(marker + b' BEGIN\n' + marker + b' END 0 1.5\n', marker)
+        with self.assertRaises(ValueError):
+            parse_tests_output(marker + b' BEGIN\n' + marker + b' OUTPUT -\n' + marker + b' END 0\n', marker)
+        with self.assertRaises(ValueError):
+            parse_tests_output(marker + b' BEGIN\n' + marker + b' OUTPUT -1\n' + marker + b' END 0\n', marker)
+
+
+class CheckTestsOutputTest(unittest.TestCase):
+    test_timeout = 1
+
+    def check(self, tests: list, output: bytes, run_times: list = None):
+        run_times = [0.5] * len(tests) if run_times is None else run_times
+        return check_tests_output(tests, output, marker, run_times, self.test_timeout)
+
+    def test_ok(self):
+        output = make_output([b'3\n', b'0'], [b'9', b'0'])
+        result = self.check([['1 2', '3'], ['4 5', '9']], output, run_times=[0.25, 0.5])
+        self.assertEqual(result.status, c.STATUS_OK)
+        self.assertEqual(result.tests_passed, 2)
+        self.assertEqual(result.tests_total, 2)
+        self.assertAlmostEqual(result.time, 0.75)
+
+    def test_trailing_newline(self):
+        for answer, expected, status in [
+            [b'3\n', '3', c.STATUS_OK],
+            [b'3\n', '3\n', c.STATUS_OK],
+            [b'3', '3', c.STATUS_OK],
+            [b'3\n\n', '3', c.STATUS_TEST_ERROR],
+            [b'33\n', '3', c.STATUS_TEST_ERROR],
+            [b'\n', '3', c.STATUS_TEST_ERROR],
+            [b'3', '3\n', c.STATUS_TEST_ERROR],
+            [b'', '3', c.STATUS_TEST_ERROR],
+        ]:
+            result = self.check([['1 2', expected]], make_output([answer, b'0']))
+            self.assertEqual(result.status, status, msg=(answer, expected))
+
+    def test_wrong_answer_message(self):
+        result = self.check([['1 2', '3']], make_output([b'4\n', b'0']))
+        self.assertEqual(result.status, c.STATUS_TEST_ERROR)
+        self.assertEqual(result.message, 'For "1 2" expected "3", but got "4"')
+
+    def test_bytes(self):
+        result = self.check([['', 'привет']], make_output(['привет\n'.encode(), b'0']))
+        self.assertEqual(result.status, c.STATUS_OK)
+
+        # answer is not decoded to be compared, so invalid utf-8 is just a wrong answer
+        result = self.check([['', '1']], make_output([b'\xff\xfe', b'0']))
+        self.assertEqual(result.status, c.STATUS_TEST_ERROR)
+        self.assertIn('�', result.message)
+
+    def test_output_file(self):
+        # output file is used instead of stdout when the solution wrote it
+        output = make_output([b'debug\n', b'0', b'3'], [b'9\n', b'0'])
+        result = self.check([['1 2', '3'], ['4 5', '9']], output)
+        self.assertEqual(result.status, c.STATUS_OK)
+        self.assertEqual(result.tests_passed, 2)
+
+        # empty output file is still an answer
+        result = self.check([['1 2', '3']], make_output([b'3\n', b'0', b'']))
+        self.assertEqual(result.status, c.STATUS_TEST_ERROR)
+
+    def test_runtime_error(self):
+        output = make_output([b'3\n', b'0'], [b'Segmentation fault\n', b'139'])
+        result = self.check([['1 2', '3'], ['4 5', '9']], output)
+        self.assertEqual(result.status, c.STATUS_RUNTIME_ERROR)
+        self.assertEqual(result.tests_passed, 1)
+        self.assertEqual(result.message, 'Segmentation fault\n')
+
+    def test_runtime_timeout(self):
+        result = self.check([['1 2', '3']], make_output([b'3\n', b'0']), run_times=[1.5])
+        self.assertEqual(result.status, c.STATUS_RUNTIME_TIMEOUT)
+        self.assertEqual(result.tests_passed, 0)
+
+    def test_partial(self):
+        # the caller decides whether the rest of the tests timed out or were interrupted
+        output = make_output([b'3\n', b'0']) + marker + b' BEGIN\n'
+        result = self.check([['1 2', '3'], ['4 5', '9']], output)
+        self.assertEqual(result.status, c.STATUS_OK)
+        self.assertEqual(result.tests_passed, 1)
+        self.assertEqual(result.tests_total, 2)
+
+    def test_without_run_time(self):
+        # test which was not seen finished while waiting for it is not counted
+        output = make_output([b'3\n', b'0'], [b'9\n', b'0'])
+        result = self.check([['1 2', '3'], ['4 5', '9']], output, run_times=[0.5])
+        self.assertEqual(result.status, c.STATUS_OK)
+        self.assertEqual(result.tests_passed, 1)
+
+    def test_faked_markers(self):
+        # extra results must not be counted even if the marker leaks to the solution
+        output = make_output([b'3\n', b'0'], [b'3\n', b'0'])
+        result = self.check([['1 2', '3']], output, run_times=[0.5, 0.5])
+        self.assertEqual(result.status, c.STATUS_OK)
+        self.assertEqual(result.tests_passed, 1)
+
+        output = marker + b' BEGIN\n3\n' + marker + b' END 0 ' + marker + b' END garbage\n'
+        result = self.check([['1 2', '3']], output)
+        self.assertEqual(result.status, c.STATUS_RUNTIME_ERROR)
+
+
+if __name__ == '__main__':
+    unittest.main()
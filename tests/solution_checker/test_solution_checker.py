@@ -129,6 +129,53 @@ print(3)
 '''
 }
 
+source_code_py_slow_tests = {
+    'Makefile': '''
+run:
+	python3 main.py
+''',
+    'main.py': '''
+import time
+
+a, b = map(int, input().split())
+time.sleep(0.5)
+print(a + b)
+'''
+}
+
+source_code_py_slow_test = {
+    'Makefile': '''
+run:
+	python3 main.py
+''',
+    'main.py': '''
+import time
+
+a, b = map(int, input().split())
+if a == -2:
+    time.sleep(10)
+print(a + b)
+'''
+}
+
+source_code_py_interrupting = {
+    'Makefile': '''
+run:
+	python3 main.py
+''',
+    'main.py': '''
+import os
+import signal
+
+a, b = map(int, input().split())
+if a == 4:
+    # kills the script running the tests, it is the parent of make
+    with open('/proc/{}/stat'.format(os.getppid())) as stat:
+        os.kill(int(stat.read().split()[3]), signal.SIGKILL)
+print(a + b)
+'''
+}
+
 
 class SolutionCheckerTest(unittest.TestCase):
     build_timeout = 2
@@ -195,6 +242,38 @@ class SolutionCheckerTest(unittest.TestCase):
         self.assertEqual(result.tests_passed, 1, msg=result.json())
         self.assertNotEqual(len(result.check_message), 0)
 
+    def test_test_timeout_per_test(self):
+        # every test has its own timeout, the whole testing could take longer than one of them
+        test_timeout = 1
+        result = sc.check_solution(source_code_py_slow_tests, self.tests[0:3], self.build_timeout, test_timeout)
+        self.assertEqual(result.check_result, c.STATUS_OK, msg=result.json())
+        self.assertEqual(result.tests_passed, 3, msg=result.json())
+        self.assertGreater(result.check_time, test_timeout)
+
+    def test_error_runtime_timeout_after_tests(self):
+        test_timeout = 0.5
+        result = sc.check_solution(source_code_py_slow_test, self.tests, self.build_timeout, test_timeout)
+        self.assertEqual(result.check_result, c.STATUS_RUNTIME_TIMEOUT, msg=result.json())
+        self.assertEqual(result.tests_passed, 2, msg=result.json())
+        # testing stops at the slow test instead of waiting for the timeout of all the tests
+        self.assertLess(result.check_time, test_timeout * 3)
+
+    def test_error_interrupted(self):
+        result = sc.check_solution(source_code_py_interrupting, self.tests, self.build_timeout, self.test_timeout)
+        self.assertEqual(result.check_result, c.STATUS_RUNTIME_ERROR, msg=result.json())
+        self.assertEqual(result.tests_passed, 1, msg=result.json())
+        self.assertEqual(result.check_message, 'Testing was interrupted after 1 tests\n')
+
+    def test_error_parse(self):
+        with self.assertRaisesRegex(Exception, 'Unable to parse source code!'):
+            sc.check_solution({**source_code_py_file, 'main.py': 1}, self.tests, self.build_timeout, self.test_timeout)
+        with self.assertRaisesRegex(Exception, 'Unable to parse source code!'):
+            sc.check_solution({**source_code_py_file, 'main.py': '\ud800'}, self.tests, self.build_timeout, self.test_timeout)
+        with self.assertRaisesRegex(Exception, 'Unable to parse tests!'):
+            sc.check_solution(source_code_py_file, [[1, '3']], self.build_timeout, self.test_timeout)
+        with self.assertRaisesRegex(Exception, 'Unable to parse tests!'):
+            sc.check_solution(source_code_py_file, [[]], self.build_timeout, self.test_timeout)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,41 @@
+import tarfile
+import unittest
+
+from solution_checker.utils import files_to_tar
+
+
+class FilesToTarTest(unittest.TestCase):
+    def test_files(self):
+        files = {
+            'Makefile': 'run:\n\tpython3 main.py\n',
+            'main.py': 'print("привет")\n',
+            'lib/sum.h': '',
+        }
+        bio = files_to_tar(files, 'source/')
+        self.assertEqual(bio.tell(), 0)
+
+        with tarfile.open(fileobj=bio) as tar:
+            members = tar.getmembers()
+            self.assertEqual([member.name for member in members], ['source/Makefile', 'source/main.py', 'source/lib/sum.h'])
+            for member in members:
+                self.assertTrue(member.isfile())
+                self.assertEqual(member.mode, 0o644)
+                content = files[member.name[len('source/'):]].encode()
+                self.assertEqual(member.size, len(content))
+                self.assertEqual(tar.extractfile(member).read(), content)
+
+    def test_bytes(self):
+        with tarfile.open(fileobj=files_to_tar({'input_0.txt': b'\xff'}, 'input/')) as tar:
+            self.assertEqual(tar.extractfile('input/input_0.txt').read(), b'\xff')
+
+    def test_empty(self):
+        with tarfile.open(fileobj=files_to_tar({}, 'input/')) as tar:
+            self.assertEqual(tar.getmembers(), [])
+
+    def test_not_a_string(self):
+        with self.assertRaises(Exception):
+            files_to_tar({'input_0.txt': 1}, 'input/')
+
+
+if __name__ == '__main__':
+    unittest.main()